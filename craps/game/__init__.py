@@ -0,0 +1,42 @@
+"""Game engine for craps.
+
+The bet and state modules can be compiled into extension modules with mypyc
+(see scripts/build_mypyc.py). Python imports the compiled modules when they
+exist, and falls back to the pure Python sources otherwise. Compiled modules are
+used even if their sources are newer, so rebuild or remove them after editing
+the sources.
+
+To keep cold starts fast, the modules avoid slow imports at startup. Names from
+typing are only imported for type checkers (TYPE_CHECKING), and fractions is
+only imported when pay_rate() of an odds bet is called. Odds bet winnings use
+integer arithmetic instead. See scripts/check_import_time.py.
+"""
+
+
+def is_compiled() -> bool:
+    """Checks if the game engine was loaded from compiled extension modules.
+
+    Also warns if a source file was changed after its module was compiled,
+    since the changes are ignored until the module is rebuilt or removed.
+    """
+    # pylint: disable=import-outside-toplevel
+    from os import path
+    from warnings import warn
+
+    from . import bet, state
+
+    if state.__file__.endswith(".py"):
+        return False
+    for module in (bet, state):
+        compiled = module.__file__
+        assert compiled is not None
+        name = module.__name__.rpartition(".")[2]
+        source = path.join(path.dirname(compiled), f"{name}.py")
+        if path.exists(source) and path.getmtime(source) > path.getmtime(compiled):
+            warn(
+                f"{source} is newer than its compiled module, which is used "
+                "instead. Run scripts/build_mypyc.py to rebuild it, or with "
+                "--clean to use the source.",
+                RuntimeWarning,
+            )
+    return True
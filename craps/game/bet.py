@@ -1,12 +1,17 @@
 """Provides classes for bets and bet types."""
 
+from __future__ import annotations
+
 import math
 from enum import Enum, unique
-from fractions import Fraction
-from typing import Type, Union
 
 from . import state as game_state
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from fractions import Fraction
+    from typing import ClassVar, Optional, Tuple, Type, Union
+
 
 @unique
 class BetType(Enum):
@@ -39,7 +44,7 @@ class Bet:
         wager: Amount of wager made on this bet. Read only.
     """
 
-    type: BetType = NotImplementedError("Must be overridden in a child class")
+    type: ClassVar[BetType]  # Must be overridden in a child class
 
     def __init__(self, *, state: "game_state.GameState") -> None:
         self._state = state
@@ -123,7 +128,7 @@ class Bet:
 class PassBet(Bet):
     """A bet on the shooter winning."""
 
-    type: BetType = BetType.PASS
+    type: ClassVar[BetType] = BetType.PASS
 
     def check(self, *, roll: int) -> BetOutcome:
         if self._state.point is None:
@@ -156,7 +161,7 @@ class PassBet(Bet):
 class DontPassBet(Bet):
     """A bet on the shooter losing."""
 
-    type: BetType = BetType.DONT_PASS
+    type: ClassVar[BetType] = BetType.DONT_PASS
 
     def check(self, *, roll: int) -> BetOutcome:
         if self._state.point is None:
@@ -187,14 +192,15 @@ class DontPassBet(Bet):
         return self.wager or (math.inf if self._state.point is None else 0)
 
 
-# Maps each point number to pay rate of a Pass Odds bet
+# Maps each point number to pay rate of a Pass Odds bet, as a tuple of
+# (numerator, denominator)
 _PASS_ODDS_PAY_RATE = {
-    4: Fraction(6, 3),
-    5: Fraction(6, 4),
-    6: Fraction(6, 5),
-    8: Fraction(6, 5),
-    9: Fraction(6, 4),
-    10: Fraction(6, 3),
+    4: (6, 3),
+    5: (6, 4),
+    6: (6, 5),
+    8: (6, 5),
+    9: (6, 4),
+    10: (6, 3),
 }
 
 # Maps each point number to maximum wager rate of a Pass Odds bet
@@ -208,10 +214,27 @@ _PASS_ODDS_MAX_WAGER_RATE = {
 }
 
 
+def _pass_odds_pay_rate(point: Optional[int]) -> Tuple[int, int]:
+    """Returns the pay rate of a Pass Odds bet for a point number.
+
+    Returns:
+        Tuple of (numerator, denominator).
+
+    Raises:
+        ValueError: If the point number is invalid.
+    """
+    if point is None or point not in _PASS_ODDS_PAY_RATE:
+        raise ValueError(
+            f"{point!r} is invalid point, expected one of "
+            f'{", ".join(map(str, _PASS_ODDS_PAY_RATE))}'
+        )
+    return _PASS_ODDS_PAY_RATE[point]
+
+
 class PassOddsBet(Bet):
     """An Odds bet on a Pass bet winning."""
 
-    type: BetType = BetType.PASS_ODDS
+    type: ClassVar[BetType] = BetType.PASS_ODDS
 
     def check(self, *, roll: int) -> BetOutcome:
         assert self._state.point is not None, "Point must be set for this bet"
@@ -222,13 +245,14 @@ class PassOddsBet(Bet):
         return BetOutcome.UNDECIDED
 
     def pay_rate(self) -> Union[float, Fraction]:
-        try:
-            return _PASS_ODDS_PAY_RATE[self._state.point]
-        except KeyError:
-            raise ValueError(
-                f"{self._state.point!r} is invalid point, expected one of "
-                f'{", ".join(_PASS_ODDS_PAY_RATE.keys())}'
-            )
+        from fractions import Fraction  # pylint: disable=import-outside-toplevel
+
+        return Fraction(*_pass_odds_pay_rate(self._state.point))
+
+    def winnings(self) -> int:
+        # Same as the base class, but avoids creating a Fraction
+        numerator, denominator = _pass_odds_pay_rate(self._state.point)
+        return self.wager * numerator // denominator
 
     def can_remove(self) -> bool:
         return True
@@ -249,7 +273,7 @@ class PassOddsBet(Bet):
 class DontPassOddsBet(Bet):
     """An Odds bet on a Don't Pass bet winning."""
 
-    type: BetType = BetType.DONT_PASS_ODDS
+    type: ClassVar[BetType] = BetType.DONT_PASS_ODDS
 
     def check(self, *, roll: int) -> BetOutcome:
         assert self._state.point is not None, "Point must be set for this bet"
@@ -260,13 +284,15 @@ class DontPassOddsBet(Bet):
         return BetOutcome.UNDECIDED
 
     def pay_rate(self) -> Union[float, Fraction]:
-        try:
-            return 1 / _PASS_ODDS_PAY_RATE[self._state.point]
-        except KeyError:
-            raise ValueError(
-                f"{self._state.point!r} is invalid point, expected one of "
-                f'{", ".join(_PASS_ODDS_PAY_RATE.keys())}'
-            )
+        from fractions import Fraction  # pylint: disable=import-outside-toplevel
+
+        numerator, denominator = _pass_odds_pay_rate(self._state.point)
+        return Fraction(denominator, numerator)
+
+    def winnings(self) -> int:
+        # Same as the base class, but avoids creating a Fraction
+        numerator, denominator = _pass_odds_pay_rate(self._state.point)
+        return self.wager * denominator // numerator
 
     def can_remove(self) -> bool:
         return True
@@ -282,9 +308,9 @@ class DontPassOddsBet(Bet):
         if not dont_pass_wager:
             return 0
         pass_odds_wager_rate = _PASS_ODDS_MAX_WAGER_RATE[self._state.point]
-        pass_odds_pay_rate = _PASS_ODDS_PAY_RATE[self._state.point]
-        # assert pass_odds_wager_rate * pass_odds_pay_rate == 6
-        return int(dont_pass_wager * pass_odds_wager_rate * pass_odds_pay_rate)
+        numerator, denominator = _PASS_ODDS_PAY_RATE[self._state.point]
+        # assert pass_odds_wager_rate * numerator / denominator == 6
+        return dont_pass_wager * pass_odds_wager_rate * numerator // denominator
 
 
 # Used by Bet.from_type()
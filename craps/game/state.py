@@ -1,10 +1,15 @@
 """Provides classes for storing and querying the game state."""
 
+from __future__ import annotations
+
 from random import randint
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from . import bet
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
 
 class YouShallNotSkipPassError(Exception):
     """Raised when the shooter didn't make a (Don't) Pass bet before the Come
@@ -54,7 +59,7 @@ class GameState:
         return self._last_roll
 
     @property
-    def point(self) -> int:
+    def point(self) -> Optional[int]:
         """Returns the current point number, or None if not set."""
         return self._point
 
@@ -169,7 +174,7 @@ class GameState:
 
         return fail_reasons
 
-    def shoot_dice(self) -> List[Tuple["bet.BetType", "bet.BetOutcome", int]]:
+    def shoot_dice(self) -> List[Tuple["bet.BetType", "bet.BetOutcome", int, int]]:
         """Performs a dice shot, updates all bets, and returns their outcomes.
 
         If the dice roll is successful, also increments the round counter.
@@ -258,7 +263,8 @@ class GameState:
 
         state = GameState(data["balance"])
         # pylint: disable=protected-access
-        state._last_roll = tuple(data["last_roll"]) or None
+        last_roll = data["last_roll"]
+        state._last_roll = (last_roll[0], last_roll[1]) if last_roll else None
         state._point = data["point"]
         state._round = data["round"]
         state._is_finished = data["is_finished"]
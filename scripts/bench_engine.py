@@ -0,0 +1,65 @@
+"""Measures the time spent per dice roll by the game engine.
+
+Run this before and after building the engine with build_mypyc.py to compare
+the pure Python and compiled modules.
+"""
+import argparse
+import random
+from time import perf_counter
+
+from simulation import STRATEGIES, BetType, GameState, play_game
+
+import game  # pylint: disable=wrong-import-order
+
+
+def bench_strategy(strategy: str, games: int) -> float:
+    """Plays games with a betting strategy and returns seconds per roll."""
+    rolls = 0
+    start = perf_counter()
+    for _ in range(games):
+        for _ in play_game(strategy, wager=10):
+            rolls += 1
+    return (perf_counter() - start) / rolls
+
+
+def bench_round_trip(rounds: int) -> float:
+    """Times a serverless style round, returning seconds per roll.
+
+    Each round deserializes a state, changes bets, rolls the dice and
+    serializes the state again, as a request handler would.
+    """
+    data = GameState(10 ** 9).serialize()
+    start = perf_counter()
+    for _ in range(rounds):
+        state = GameState.deserialize(data)
+        if state.is_finished:
+            state.reset()
+        if state.point is None:
+            state.set_bets([(BetType.PASS, 10)])
+        else:
+            state.set_bets([(BetType.PASS_ODDS, state.get_bet(BetType.PASS).wager)])
+        state.shoot_dice()
+        data = state.serialize()
+    return (perf_counter() - start) / rounds
+
+
+def main() -> None:
+    """Runs all benchmarks and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20000, help="games per run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    kind = "compiled" if game.is_compiled() else "pure Python"
+    print(f"Game engine: {kind}")
+    for strategy in STRATEGIES:
+        random.seed(args.seed)
+        per_roll = bench_strategy(strategy, args.games)
+        print(f"  {strategy:<16} {per_roll * 1e6:8.2f} us/roll")
+    random.seed(args.seed)
+    per_roll = bench_round_trip(args.games * 3)
+    print(f"  {'round trip':<16} {per_roll * 1e6:8.2f} us/roll")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compiles the game engine with mypyc, or removes the compiled modules.
+
+The compiled modules are placed next to their sources in craps/game/, where
+they take precedence over the pure Python modules when imported. They are
+specific to the Python version and platform used to build them.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+from glob import glob
+from importlib.machinery import EXTENSION_SUFFIXES
+from os import path, remove
+
+CRAPS_DIR = path.join(path.dirname(path.abspath(__file__)), "..", "craps")
+
+# Modules to compile, relative to CRAPS_DIR
+MODULES = ("game/bet.py", "game/state.py")
+
+
+def build() -> None:
+    """Compiles the game engine modules in place."""
+    subprocess.run([sys.executable, "-m", "mypyc", *MODULES], cwd=CRAPS_DIR, check=True)
+
+
+def clean() -> None:
+    """Removes compiled modules and build artifacts."""
+    for directory in (CRAPS_DIR, path.join(CRAPS_DIR, "game")):
+        for suffix in EXTENSION_SUFFIXES:
+            for file_name in glob(path.join(directory, f"*{suffix}")):
+                print(f"removing {file_name}")
+                remove(file_name)
+    shutil.rmtree(path.join(CRAPS_DIR, "build"), ignore_errors=True)
+    shutil.rmtree(path.join(CRAPS_DIR, ".mypy_cache"), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--clean", action="store_true", help="remove compiled modules instead"
+    )
+    if parser.parse_args().clean:
+        clean()
+    else:
+        build()
@@ -0,0 +1,87 @@
+"""Checks that importing the game engine stays within a cold start budget.
+
+Imports a module in fresh interpreters using `python -X importtime`, and fails
+if the fastest run exceeds the budget. Sources are compiled to bytecode first,
+so that the time taken to compile them is not included. Use --profile to list
+the slowest imports, which is a good starting point for reducing cold start
+time.
+"""
+import argparse
+import compileall
+import subprocess
+import sys
+from os import path
+from typing import Dict, List, Tuple
+
+CRAPS_DIR = path.join(path.dirname(path.abspath(__file__)), "..", "craps")
+
+
+def measure_import(module: str) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """Imports a module in a fresh interpreter and measures the time taken.
+
+    Returns:
+        Tuple of (total microseconds, entries), where entries is a list of
+        (self microseconds, cumulative microseconds, indented module name) for
+        each module imported, in the order printed by -X importtime.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=CRAPS_DIR,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        if self_time.strip().isdigit():
+            entries.append((int(self_time), int(cumulative), name.rstrip()))
+    total = sum(cum for _, cum, name in entries if name.strip() == module)
+    return total, entries
+
+
+def main() -> int:
+    """Measures the import time and returns the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--module", default="game.state", help="module to import (from craps/)"
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, default=15, help="maximum import time allowed"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="number of runs")
+    parser.add_argument(
+        "--profile", type=int, default=0, metavar="N", help="show N slowest imports"
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, CRAPS_DIR)
+    import game  # pylint: disable=import-outside-toplevel
+
+    kind = "compiled" if game.is_compiled() else "pure Python"
+    print(f"Game engine: {kind}")
+
+    compileall.compile_dir(CRAPS_DIR, quiet=1)
+    # The fastest run is the least affected by noise from other processes
+    runs: Dict[int, List[Tuple[int, int, str]]] = dict(
+        measure_import(args.module) for _ in range(args.runs)
+    )
+    total = min(runs)
+    print(f"Importing {args.module} took {total / 1000:.1f} ms")
+
+    if args.profile:
+        print(f"{'self (ms)':>10} {'cumulative':>10}  module")
+        slowest = sorted(runs[total], key=lambda entry: entry[1], reverse=True)
+        for self_time, cumulative, name in slowest[: args.profile]:
+            print(f"{self_time / 1000:10.1f} {cumulative / 1000:10.1f} {name}")
+
+    if total > args.budget_ms * 1000:
+        print(f"Import time exceeds budget of {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Exports per-roll results of simulated games to columnar files.
+
+Plays games with the game engine and writes one record per bet per roll, with
+the columns listed in COLUMNS. Records are collected in fixed-size chunks of
+typed arrays and written out one chunk at a time, so the whole run is never
+held in memory.
+
+Supported output formats:
+
+- npy: A directory with one .npy file per column and a metadata.json file
+  describing the dictionaries of the enum columns. Written using only the
+  standard library. Load with numpy.load(file, mmap_mode="r").
+- arrow: An Arrow IPC file with one record batch per chunk. Requires pyarrow.
+  Open with pyarrow.ipc.open_file(pyarrow.memory_map(file)).
+- parquet: A Parquet file with one row group per chunk. Requires pyarrow.
+
+Enum columns (bet_type, outcome) are dictionary encoded as int8 codes.
+"""
+import argparse
+import json
+import random
+import struct
+import sys
+from array import array
+from os import makedirs, path
+from typing import Dict, Iterator, List, Sequence, Union
+
+from simulation import STRATEGIES, BetOutcome, BetType, play_game
+
+# Tuples of (column name, array typecode, numpy dtype)
+COLUMNS = (
+    ("game_id", "q", "<i8"),
+    ("round", "i", "<i4"),
+    ("die1", "b", "|i1"),
+    ("die2", "b", "|i1"),
+    ("point", "b", "|i1"),  # 0 if not set
+    ("bet_type", "b", "|i1"),
+    ("outcome", "b", "|i1"),
+    ("wager", "q", "<i8"),
+    ("winnings", "q", "<i8"),
+)
+
+# Maps each dictionary encoded column to the values of its codes
+DICTIONARIES = {
+    "bet_type": [bet_type.value for bet_type in BetType],
+    "outcome": [outcome.name for outcome in BetOutcome],
+}
+
+_BET_TYPE_CODES = {bet_type: code for code, bet_type in enumerate(BetType)}
+_OUTCOME_CODES = {outcome: code for code, outcome in enumerate(BetOutcome)}
+
+# Size of .npy headers, which leaves room for any row count to be filled in
+_NPY_HEADER_SIZE = 128
+
+
+def simulate_chunks(
+    games: int, strategies: Sequence[str], wager: int, chunk_size: int
+) -> Iterator[Dict[str, array]]:
+    """Plays games and yields their per-roll records in chunks.
+
+    Games take turns using each strategy in strategies.
+
+    Yields:
+        Dictionaries that map each column name to an array of values. Each
+        array has chunk_size items, except in the last chunk.
+    """
+    chunk = {name: array(typecode) for name, typecode, _ in COLUMNS}
+    for game_id in range(games):
+        strategy = strategies[game_id % len(strategies)]
+        for state, point, results in play_game(strategy, wager):
+            assert state.last_roll is not None
+            (die1, die2) = state.last_roll
+            for bet_type, outcome, bet_wager, winnings in results:
+                chunk["game_id"].append(game_id)
+                chunk["round"].append(state.round - 1)
+                chunk["die1"].append(die1)
+                chunk["die2"].append(die2)
+                chunk["point"].append(point or 0)
+                chunk["bet_type"].append(_BET_TYPE_CODES[bet_type])
+                chunk["outcome"].append(_OUTCOME_CODES[outcome])
+                chunk["wager"].append(bet_wager)
+                chunk["winnings"].append(winnings)
+            if len(chunk["game_id"]) >= chunk_size:
+                yield chunk
+                chunk = {name: array(typecode) for name, typecode, _ in COLUMNS}
+    if chunk["game_id"]:
+        yield chunk
+
+
+def _npy_header(dtype: str, rows: int) -> bytes:
+    """Creates a version 1.0 .npy header for a 1-D array."""
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({rows},), }}"
+    # Magic string (6 bytes), version (2 bytes), header length (2 bytes)
+    header = header.ljust(_NPY_HEADER_SIZE - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode()
+
+
+class NpyWriter:
+    """Writes each column to a .npy file in a directory.
+
+    Args:
+        directory: Output directory. Created if it does not exist.
+    """
+
+    def __init__(self, directory: str) -> None:
+        makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._rows = 0
+        self._files = {}
+        for name, _, dtype in COLUMNS:
+            file = open(path.join(directory, f"{name}.npy"), "wb")
+            # Reserve space for the header, which is rewritten when closed
+            file.write(_npy_header(dtype, 0))
+            self._files[name] = file
+
+    def write(self, chunk: Dict[str, array]) -> None:
+        """Appends a chunk of records."""
+        for name, _, _ in COLUMNS:
+            values = chunk[name]
+            if sys.byteorder == "big" and values.itemsize > 1:
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(self._files[name])
+        self._rows += len(chunk["game_id"])
+
+    def close(self) -> None:
+        """Fills in the row count of each file and writes metadata.json."""
+        for name, _, dtype in COLUMNS:
+            file = self._files[name]
+            file.seek(0)
+            file.write(_npy_header(dtype, self._rows))
+            file.close()
+        metadata = {
+            "rows": self._rows,
+            "columns": {name: dtype for name, _, dtype in COLUMNS},
+            "dictionaries": DICTIONARIES,
+        }
+        metadata_path = path.join(self._directory, "metadata.json")
+        with open(metadata_path, "w", encoding="utf-8") as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+
+class ArrowWriter:
+    """Writes records to an Arrow IPC file or a Parquet file.
+
+    Args:
+        file_name: Output file.
+        parquet: If True, writes Parquet instead of Arrow.
+    """
+
+    def __init__(self, file_name: str, parquet: bool = False) -> None:
+        # pylint: disable=import-outside-toplevel
+        try:
+            import pyarrow as pa
+        except ImportError:
+            message = "pyarrow is required to export Arrow or Parquet files"
+            raise SystemExit(message) from None
+
+        self._pa = pa
+        arrow_types = {"q": pa.int64(), "i": pa.int32(), "b": pa.int8()}
+        self._types = {name: arrow_types[typecode] for name, typecode, _ in COLUMNS}
+        self._dictionaries = {
+            name: pa.array(values, pa.string()) for name, values in DICTIONARIES.items()
+        }
+        self._schema = pa.schema(
+            [
+                (name, pa.dictionary(self._types[name], pa.string()))
+                if name in DICTIONARIES
+                else (name, self._types[name])
+                for name, _, _ in COLUMNS
+            ]
+        )
+        if parquet:
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(file_name, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(file_name, self._schema)
+
+    def write(self, chunk: Dict[str, array]) -> None:
+        """Appends a chunk of records as a record batch."""
+        pa = self._pa
+        columns: List[object] = []
+        for name, _, _ in COLUMNS:
+            values = chunk[name]
+            # Wrap the array's memory instead of converting each item
+            column = pa.Array.from_buffers(
+                self._types[name], len(values), [None, pa.py_buffer(values)]
+            )
+            if name in DICTIONARIES:
+                column = pa.DictionaryArray.from_arrays(
+                    column, self._dictionaries[name]
+                )
+            columns.append(column)
+        batch = pa.RecordBatch.from_arrays(columns, schema=self._schema)
+        self._writer.write_table(pa.Table.from_batches([batch]))
+
+    def close(self) -> None:
+        """Finishes writing the file."""
+        self._writer.close()
+
+
+def main() -> None:
+    """Runs the simulation and exports its results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="output file, or directory for npy")
+    parser.add_argument(
+        "--format", choices=("arrow", "parquet", "npy"), default="arrow"
+    )
+    parser.add_argument("--games", type=int, default=100000, help="games to play")
+    parser.add_argument(
+        "--strategy",
+        choices=STRATEGIES,
+        action="append",
+        help="betting strategy, can be repeated (default: all strategies)",
+    )
+    parser.add_argument("--wager", type=int, default=10, help="line bet wager")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--chunk-size", type=int, default=65536, help="records per chunk"
+    )
+    args = parser.parse_args()
+
+    writer: Union[NpyWriter, ArrowWriter]
+    if args.format == "npy":
+        writer = NpyWriter(args.output)
+    else:
+        writer = ArrowWriter(args.output, parquet=args.format == "parquet")
+
+    random.seed(args.seed)
+    rows = 0
+    try:
+        for chunk in simulate_chunks(
+            args.games, args.strategy or list(STRATEGIES), args.wager, args.chunk_size
+        ):
+            writer.write(chunk)
+            rows += len(chunk["game_id"])
+    finally:
+        writer.close()
+    print(f"Exported {rows} records from {args.games} games to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
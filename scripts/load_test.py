@@ -0,0 +1,376 @@
+"""Replays Slack payloads against a WSGI app and reports latency and throughput.
+
+Synthesizes Slack slash command and block action payloads that carry
+serialized game states in every phase of a game (Come Out, point, odds bets
+placed, finished), or replays payloads saved to a file earlier. The payloads are
+sent concurrently at a configurable rate to a WSGI app called in-process, or to
+a running server at a URL. A mock Slack endpoint running locally receives any
+messages the app posts to the response_url of each payload.
+
+Until the Slack request handler is added to this repo, the default target is
+engine_app(), a stand-in that does the same game engine work per request.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from importlib import import_module
+from io import BytesIO
+from socketserver import ThreadingMixIn
+from statistics import quantiles
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, quote_plus, urlencode
+from urllib.request import Request, urlopen
+from wsgiref.util import setup_testing_defaults
+
+from simulation import STRATEGIES, BetType, GameState, play_game
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Placeholder in saved payloads, replaced by the URL of the mock Slack endpoint.
+# It is left unchanged by JSON and URL encoding.
+RESPONSE_URL = "__RESPONSE_URL__"
+
+# A payload is a tuple of (description, content type, body)
+Payload = Tuple[str, str, str]
+
+# Wager for line bets, which have no maximum before the Come Out roll
+LINE_WAGER = 10
+
+
+def snapshot_states(seed: int, games: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Plays games with each betting strategy and yields serialized states.
+
+    Yields:
+        Tuples of (phase name, serialized state).
+    """
+    random.seed(seed)
+    for strategy, (line_bet, _) in STRATEGIES.items():
+        state = GameState(1000)
+        yield "come_out", state.serialize()
+        state.set_bets([(line_bet, LINE_WAGER)])
+        yield "come_out", state.serialize()
+        for _ in range(games):
+            for state, _, _ in play_game(strategy, LINE_WAGER, balance=1000):
+                if state.is_finished:
+                    yield "finished", state.serialize()
+                elif len(state.bets) > 1:
+                    yield "odds", state.serialize()
+                else:
+                    yield "point", state.serialize()
+
+
+def slash_command_payload(text: str) -> Payload:
+    """Creates a payload for a /craps slash command."""
+    body = urlencode(
+        {
+            "token": "load-test",
+            "team_id": "T0000",
+            "channel_id": "C0000",
+            "user_id": "U0000",
+            "user_name": "load-test",
+            "command": "/craps",
+            "text": text,
+            "response_url": RESPONSE_URL,
+            "trigger_id": "0.0.0",
+        }
+    )
+    return "slash_command", FORM_CONTENT_TYPE, body
+
+
+def block_action_payload(phase: str, action_id: str, value: Dict[str, Any]) -> Payload:
+    """Creates a payload for a button click carrying a value."""
+    payload = {
+        "type": "block_actions",
+        "team": {"id": "T0000"},
+        "user": {"id": "U0000", "name": "load-test"},
+        "channel": {"id": "C0000"},
+        "response_url": RESPONSE_URL,
+        "trigger_id": "0.0.0",
+        "actions": [
+            {
+                "type": "button",
+                "action_id": action_id,
+                "block_id": "craps",
+                "value": json.dumps(value, separators=(",", ":")),
+            }
+        ],
+    }
+    body = urlencode({"payload": json.dumps(payload, separators=(",", ":"))})
+    return f"{action_id}:{phase}", FORM_CONTENT_TYPE, body
+
+
+def synthesize_payloads(seed: int, games: int) -> List[Payload]:
+    """Creates payloads for every kind of request, in all phases of a game."""
+    payloads = [slash_command_payload(""), slash_command_payload("1000")]
+    for phase, data in snapshot_states(seed, games):
+        state = GameState.deserialize(data)
+        if state.is_finished:
+            payloads.append(block_action_payload(phase, "new_game", {"state": data}))
+            continue
+        if state.bets:
+            payloads.append(block_action_payload(phase, "shoot_dice", {"state": data}))
+        for bet_type in BetType:
+            max_wager = state.get_bet(bet_type).max_wager()
+            if max_wager == math.inf:
+                max_wager = LINE_WAGER
+            wager = min(int(max_wager), state.balance)
+            if wager > 0 or state.bets.get(bet_type):
+                value = {"state": data, "bet_type": bet_type.value, "wager": wager}
+                payloads.append(block_action_payload(phase, "set_bet", value))
+    return payloads
+
+
+def engine_app(environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+    """A stand-in WSGI app for the Slack request handler.
+
+    Parses a payload, runs the requested game action and posts the updated
+    state back to the response_url, like the real handler would.
+    """
+    size = int(environ.get("CONTENT_LENGTH") or 0)
+    form = parse_qs(environ["wsgi.input"].read(size).decode())
+
+    if "payload" in form:
+        payload = json.loads(form["payload"][0])
+        (action,) = payload["actions"]
+        value = json.loads(action["value"])
+        state = GameState.deserialize(value["state"])
+        if action["action_id"] == "new_game":
+            state.reset()
+        elif action["action_id"] == "set_bet":
+            state.set_bets([(BetType(value["bet_type"]), value["wager"])])
+        elif action["action_id"] == "shoot_dice":
+            state.shoot_dice()
+        else:
+            start_response("400 Bad Request", [("Content-Type", "text/plain")])
+            return [b"Unknown action"]
+        message = json.dumps({"state": state.serialize()}).encode()
+        request = Request(
+            payload["response_url"],
+            data=message,
+            headers={"Content-Type": "application/json"},
+        )
+        with urlopen(request, timeout=10) as response:
+            response.read()
+        start_response("200 OK", [("Content-Length", "0")])
+        return [b""]
+
+    text = form.get("text", [""])[0].strip()
+    state = GameState(int(text) if text.isdigit() else 1000)
+    body = json.dumps({"state": state.serialize()}).encode()
+    start_response(
+        "200 OK",
+        [("Content-Type", "application/json"), ("Content-Length", str(len(body)))],
+    )
+    return [body]
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _MockSlackHandler(BaseHTTPRequestHandler):
+    """Accepts any POST request, like the response_url endpoint of Slack."""
+
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Reads and discards the message."""
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.lock:
+            _MockSlackHandler.received += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def start_mock_slack() -> Tuple[HTTPServer, str]:
+    """Starts a mock Slack endpoint in a background thread.
+
+    Returns:
+        Tuple of (server, response_url).
+    """
+    server = _ThreadingHTTPServer(("127.0.0.1", 0), _MockSlackHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/response"
+
+
+def wsgi_sender(app: Callable) -> Callable[[str, bytes], int]:
+    """Returns a function that sends a request to a WSGI app in-process."""
+
+    def send(content_type: str, body: bytes) -> int:
+        environ: Dict[str, Any] = {
+            "REQUEST_METHOD": "POST",
+            "CONTENT_TYPE": content_type,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": BytesIO(body),
+        }
+        setup_testing_defaults(environ)
+        status: List[str] = []
+        result = app(environ, lambda s, headers, exc_info=None: status.append(s))
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return int(status[-1].split()[0])
+
+    return send
+
+
+def url_sender(url: str) -> Callable[[str, bytes], int]:
+    """Returns a function that sends a request to a running server."""
+
+    def send(content_type: str, body: bytes) -> int:
+        request = Request(url, data=body, headers={"Content-Type": content_type})
+        with urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+
+    return send
+
+
+def run_load(
+    send: Callable[[str, bytes], int],
+    payloads: List[Payload],
+    response_url: str,
+    requests: int,
+    rate: float,
+    concurrency: int,
+) -> Tuple[float, List[Tuple[str, float, Optional[str]]]]:
+    """Sends payloads round robin, at a fixed rate if given.
+
+    With a rate limit, latency is measured from the time each request was
+    scheduled to be sent, so time spent waiting for a free worker counts
+    towards it. Otherwise, it is measured from when a worker sends it.
+
+    Returns:
+        Tuple of (elapsed seconds, results), where results is a list of
+        (description, latency in seconds, error message or None).
+    """
+    results: List[Tuple[str, float, Optional[str]]] = []
+    start = perf_counter()
+
+    def fire(i: int) -> None:
+        description, content_type, body = payloads[i % len(payloads)]
+        scheduled = start + i / rate if rate else perf_counter()
+        delay = scheduled - perf_counter()
+        if delay > 0:
+            sleep(delay)
+        error = None
+        try:
+            body = body.replace(RESPONSE_URL, quote_plus(response_url))
+            status = send(content_type, body.encode())
+            if status >= 400:
+                error = f"HTTP {status}"
+        except Exception as exc:  # pylint: disable=broad-except
+            error = repr(exc)
+        results.append((description, perf_counter() - scheduled, error))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(fire, i) for i in range(requests)]:
+            future.result()
+    return perf_counter() - start, results
+
+
+def report(elapsed: float, results: List[Tuple[str, float, Optional[str]]]) -> None:
+    """Prints latency percentiles, error rates and throughput.
+
+    Results are broken down by action, and by action and game phase.
+    """
+    by_kind: Dict[str, List[Tuple[float, Optional[str]]]] = {}
+    for description, latency, error in results:
+        kinds = {"all", description.split(":")[0], description}
+        for kind in kinds:
+            by_kind.setdefault(kind, []).append((latency, error))
+
+    print(f"{len(results)} requests in {elapsed:.2f} s", end="")
+    print(f" ({len(results) / elapsed:.1f} requests/s)")
+    print(f"{'kind':<24} {'count':>6} {'errors':>7} {'p50':>8} {'p90':>8}", end="")
+    print(f" {'p99':>8} {'max':>8}  (ms)")
+    for kind, entries in sorted(by_kind.items()):
+        latencies = sorted(latency * 1000 for latency, _ in entries)
+        errors = sum(1 for _, error in entries if error)
+        if len(latencies) > 1:
+            cuts = quantiles(latencies, n=100, method="inclusive")
+        else:
+            cuts = latencies * 99
+        print(
+            f"{kind:<24} {len(entries):6d} {errors / len(entries):7.1%}"
+            f" {cuts[49]:8.2f} {cuts[89]:8.2f} {cuts[98]:8.2f} {latencies[-1]:8.2f}"
+        )
+
+    messages = sorted({error for _, _, error in results if error})
+    for message in messages[:10]:
+        print(f"error: {message}", file=sys.stderr)
+
+
+def main() -> int:
+    """Runs the load test and returns the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "--app", help="WSGI app to call in-process, as module:attribute (from craps/)"
+    )
+    target.add_argument("--url", help="URL of a running server to send requests to")
+    parser.add_argument("--requests", type=int, default=2000, help="requests to send")
+    parser.add_argument(
+        "--rate", type=float, default=0, help="requests per second (0: unlimited)"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--games", type=int, default=5, help="games per strategy to take states from"
+    )
+    parser.add_argument("--replay", help="read payloads saved with --save instead")
+    parser.add_argument("--save", help="save the payloads as JSON lines and exit")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as file:
+            payloads = [tuple(json.loads(line)) for line in file if line.strip()]
+    else:
+        payloads = synthesize_payloads(args.seed, args.games)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            for payload in payloads:
+                file.write(json.dumps(payload) + "\n")
+        print(f"Saved {len(payloads)} payloads to {args.save}")
+        return 0
+
+    if args.url:
+        send = url_sender(args.url)
+    elif args.app:
+        module_name, _, attribute = args.app.partition(":")
+        send = wsgi_sender(getattr(import_module(module_name), attribute or "app"))
+    else:
+        send = wsgi_sender(engine_app)
+
+    server, response_url = start_mock_slack()
+    try:
+        random.seed(args.seed)
+        elapsed, results = run_load(
+            send, payloads, response_url, args.requests, args.rate, args.concurrency
+        )
+    finally:
+        server.shutdown()
+    report(elapsed, results)
+    print(f"Mock Slack endpoint received {_MockSlackHandler.received} messages")
+    return 1 if any(error for _, _, error in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
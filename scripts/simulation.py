@@ -0,0 +1,57 @@
+"""Helpers shared by scripts that drive the craps game engine directly."""
+import sys
+from os import path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Allow importing the game engine the same way termcraps.py does
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "craps"))
+
+# pylint: disable=wrong-import-position
+from game.bet import BetOutcome, BetType  # noqa: E402
+from game.state import GameState  # noqa: E402
+
+# pylint: enable=wrong-import-position
+
+# Maps each betting strategy to a (line bet, odds bet or None) pair
+STRATEGIES: Dict[str, Tuple[BetType, Optional[BetType]]] = {
+    "pass": (BetType.PASS, None),
+    "pass_odds": (BetType.PASS, BetType.PASS_ODDS),
+    "dont_pass": (BetType.DONT_PASS, None),
+    "dont_pass_odds": (BetType.DONT_PASS, BetType.DONT_PASS_ODDS),
+}
+
+# Large enough that a simulated player never runs out of money
+DEFAULT_BALANCE = 10 ** 9
+
+
+def play_game(
+    strategy: str, wager: int, balance: int = DEFAULT_BALANCE
+) -> Iterator[
+    Tuple[GameState, Optional[int], List[Tuple[BetType, BetOutcome, int, int]]]
+]:
+    """Plays a single game using a betting strategy, yielding after each roll.
+
+    The line bet is made before the Come Out roll. If the strategy takes odds,
+    the maximum allowed odds bet is added as soon as a point is established.
+
+    Args:
+        strategy: Name of a strategy in STRATEGIES.
+        wager: Amount of wager for the line bet.
+        balance: Starting balance of the player.
+
+    Yields:
+        Tuples of (state, point, results), where point is the point number
+        before the roll and results is the return value of shoot_dice().
+    """
+    line_bet, odds_bet = STRATEGIES[strategy]
+    state = GameState(balance)
+    (fail_reason,) = state.set_bets([(line_bet, wager)])
+    assert not fail_reason, f"Cannot make a {line_bet} bet: {fail_reason}"
+
+    while not state.is_finished:
+        point = state.point
+        if odds_bet is not None and point is not None and odds_bet not in state.bets:
+            odds_wager = state.get_bet(odds_bet).max_wager()
+            (fail_reason,) = state.set_bets([(odds_bet, odds_wager)])
+            assert not fail_reason, f"Cannot make a {odds_bet} bet: {fail_reason}"
+        yield state, point, state.shoot_dice()
@@ -0,0 +1,434 @@
+"""Verifies that the game engine implements the rules of craps exactly.
+
+Runs two kinds of checks:
+
+1. An exhaustive check that rolls all 36 dice combinations against every
+   distinct game state, twice each, and compares the outcomes and payouts with
+   a table of the rules written independently of the engine.
+2. A large seeded simulation, spread across processes, whose dice frequencies,
+   bet outcome frequencies and average payouts are tested against their exact
+   analytic values using chi-square tests, G-tests and z-tests.
+
+Exits with a nonzero status if any check fails.
+"""
+import argparse
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from fractions import Fraction
+from itertools import product
+from math import exp, lgamma, log, sqrt
+from statistics import NormalDist
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from simulation import STRATEGIES, BetOutcome, BetType, GameState, play_game
+
+import game.state  # pylint: disable=wrong-import-order
+
+DICE = tuple(product(range(1, 7), repeat=2))
+POINTS = (4, 5, 6, 8, 9, 10)
+
+# Exact probability of each dice roll sum
+ROLL_PROBABILITY = {
+    total: Fraction(sum(1 for a, b in DICE if a + b == total), len(DICE))
+    for total in range(2, 13)
+}
+
+# Exact probability of each outcome of a line bet, over a whole game
+LINE_BET_OUTCOME_PROBABILITY = {
+    BetType.PASS: {
+        BetOutcome.WIN: Fraction(244, 495),
+        BetOutcome.LOSE: Fraction(251, 495),
+    },
+    BetType.DONT_PASS: {
+        BetOutcome.WIN: Fraction(949, 1980),
+        BetOutcome.LOSE: Fraction(976, 1980),
+        BetOutcome.TIE: Fraction(55, 1980),
+    },
+}
+
+# Exact expected net gain per unit of line bet wager, over a whole game.
+# Odds bets are paid at true odds and do not change these values.
+LINE_BET_EXPECTED_GAIN = {
+    BetType.PASS: Fraction(-7, 495),
+    BetType.DONT_PASS: Fraction(-3, 220),
+}
+
+# Smallest number of games per strategy for the statistical tests to be useful
+MIN_GAMES = 1000
+
+# Maps each point number to the true odds paid by a Pass Odds bet
+TRUE_ODDS = {
+    4: Fraction(2, 1),
+    5: Fraction(3, 2),
+    6: Fraction(6, 5),
+    8: Fraction(6, 5),
+    9: Fraction(3, 2),
+    10: Fraction(2, 1),
+}
+
+
+def expected_outcome(bet_type: BetType, point: Optional[int], roll: int) -> BetOutcome:
+    """Returns the outcome of a bet according to the rules of craps."""
+    if point is None:
+        assert bet_type in (BetType.PASS, BetType.DONT_PASS)
+        if roll in (7, 11):
+            win = bet_type == BetType.PASS
+        elif roll in (2, 3):
+            win = bet_type == BetType.DONT_PASS
+        elif roll == 12:
+            return BetOutcome.LOSE if bet_type == BetType.PASS else BetOutcome.TIE
+        else:
+            return BetOutcome.UNDECIDED
+    elif roll in (7, point):
+        win = (roll == point) == (bet_type in (BetType.PASS, BetType.PASS_ODDS))
+    else:
+        return BetOutcome.UNDECIDED
+    return BetOutcome.WIN if win else BetOutcome.LOSE
+
+
+def expected_winnings(
+    bet_type: BetType, point: Optional[int], outcome: BetOutcome, wager: int
+) -> int:
+    """Returns the amount returned to the player, including the wager."""
+    if outcome == BetOutcome.TIE:
+        return wager
+    if outcome != BetOutcome.WIN:
+        return 0
+    if bet_type in (BetType.PASS_ODDS, BetType.DONT_PASS_ODDS):
+        assert point is not None, "Odds bets require a point"
+        rate = TRUE_ODDS[point]
+        if bet_type == BetType.DONT_PASS_ODDS:
+            rate = 1 / rate
+    else:
+        rate = Fraction(1)
+    return wager + wager * rate.numerator // rate.denominator
+
+
+@contextmanager
+def fixed_dice(dice: Sequence[int]) -> Iterator[None]:
+    """Makes the game engine roll the given die values, in order."""
+    values = iter(dice)
+    old_randint = game.state.randint
+    game.state.randint = lambda a, b: next(values)
+    try:
+        yield
+    finally:
+        game.state.randint = old_randint
+
+
+def create_state(point: Optional[int], odds_wager: Optional[int]) -> GameState:
+    """Creates a game state with both line bets made, and a point if given.
+
+    If odds_wager is None, the maximum odds bets are made instead.
+    """
+    state = GameState(10 ** 6)
+    bets = [(BetType.PASS, 7), (BetType.DONT_PASS, 7)]
+    assert not any(state.set_bets(bets))
+    if point is not None:
+        with fixed_dice((1, point - 1) if point <= 7 else (6, point - 6)):
+            state.shoot_dice()
+        assert state.point == point
+        for bet_type in (BetType.PASS_ODDS, BetType.DONT_PASS_ODDS):
+            if odds_wager is None:
+                bets.append((bet_type, int(state.get_bet(bet_type).max_wager())))
+            else:
+                bets.append((bet_type, odds_wager))
+        assert not any(state.set_bets(bets))
+    return state
+
+
+def check_exhaustive() -> List[str]:
+    """Rolls every dice combination against every distinct game state.
+
+    Returns:
+        List of error messages. Empty if all checks pass.
+    """
+    errors = []
+    states = [(None, None)] + [
+        (point, odds_wager) for point in POINTS for odds_wager in (1, 5, None)
+    ]
+    for (point, odds_wager), dice in product(states, DICE):
+        roll = sum(dice)
+        context = f"point={point}, odds_wager={odds_wager}, dice={dice}"
+
+        runs = []
+        for _ in range(2):
+            state = create_state(point, odds_wager)
+            old_bets = dict(state.bets)
+            old_balance = state.balance
+            old_round = state.round
+            with fixed_dice(dice):
+                results = state.shoot_dice()
+            runs.append((results, state.serialize()))
+        if runs[0] != runs[1]:
+            errors.append(f"{context}: nondeterministic result {runs!r}")
+            continue
+
+        if {bet_type for bet_type, _, _, _ in results} != set(old_bets):
+            errors.append(f"{context}: results do not cover all bets {results!r}")
+
+        total_winnings = 0
+        for bet_type, outcome, wager, winnings in results:
+            expected = expected_outcome(bet_type, point, roll)
+            if outcome != expected:
+                errors.append(
+                    f"{context}: {bet_type} should be {expected}, got {outcome}"
+                )
+            if wager != old_bets.get(bet_type):
+                errors.append(f"{context}: {bet_type} reported wrong wager {wager}")
+            payout = expected_winnings(bet_type, point, outcome, wager)
+            if winnings != payout:
+                errors.append(
+                    f"{context}: {bet_type} should pay {payout}, got {winnings}"
+                )
+            total_winnings += winnings
+            if (bet_type in state.bets) != (outcome == BetOutcome.UNDECIDED):
+                errors.append(f"{context}: {bet_type} not cleared correctly")
+
+        pass_outcome = expected_outcome(BetType.PASS, point, roll)
+        expected_point = roll if point is None else point
+        if state.balance != old_balance + total_winnings:
+            errors.append(f"{context}: wrong balance {state.balance}")
+        if state.is_finished != (pass_outcome != BetOutcome.UNDECIDED):
+            errors.append(f"{context}: wrong is_finished {state.is_finished}")
+        if not state.is_finished and state.point != expected_point:
+            errors.append(f"{context}: wrong point {state.point}")
+        if state.round != old_round + 1:
+            errors.append(f"{context}: wrong round {state.round}")
+        if state.last_roll != dice:
+            errors.append(f"{context}: wrong last_roll {state.last_roll}")
+    return errors
+
+
+@dataclass
+class Tally:
+    """Totals of the results of simulated games.
+
+    Attributes:
+        games: Number of games played.
+        dice_counts: Number of times each item in DICE was rolled.
+        outcome_counts: Number of times the line bet had each final outcome.
+        gain_sum: Sum of the net gain of each game.
+        gain_square_sum: Sum of the squared net gain of each game.
+    """
+
+    games: int = 0
+    dice_counts: List[int] = field(default_factory=lambda: [0] * len(DICE))
+    outcome_counts: Dict[BetOutcome, int] = field(
+        default_factory=lambda: {outcome: 0 for outcome in BetOutcome}
+    )
+    gain_sum: int = 0
+    gain_square_sum: int = 0
+
+    def merge(self, other: "Tally") -> None:
+        """Adds the totals of another tally to this one."""
+        self.games += other.games
+        self.gain_sum += other.gain_sum
+        self.gain_square_sum += other.gain_square_sum
+        for i, count in enumerate(other.dice_counts):
+            self.dice_counts[i] += count
+        for outcome, count in other.outcome_counts.items():
+            self.outcome_counts[outcome] += count
+
+
+def simulate(strategy: str, seed: int, games: int) -> Tally:
+    """Plays many games with a strategy and tallies the results.
+
+    Runs in a worker process. Since the game engine uses the global random
+    number generator, each worker seeds it separately.
+    """
+    random.seed(seed)
+    line_bet, _ = STRATEGIES[strategy]
+    tally = Tally(games=games)
+
+    for _ in range(games):
+        gain = 0
+        for state, _, results in play_game(strategy, wager=10):
+            assert state.last_roll is not None
+            (a, b) = state.last_roll
+            tally.dice_counts[(a - 1) * 6 + (b - 1)] += 1
+            for bet_type, outcome, wager, winnings in results:
+                if outcome == BetOutcome.UNDECIDED:
+                    continue
+                gain += winnings - wager
+                if bet_type == line_bet:
+                    tally.outcome_counts[outcome] += 1
+        tally.gain_sum += gain
+        tally.gain_square_sum += gain * gain
+
+    return tally
+
+
+def chi2_sf(stat: float, df: int) -> float:
+    """Returns the survival function of the chi-square distribution."""
+    # Regularized upper incomplete gamma function Q(df / 2, stat / 2)
+    a, x = df / 2, stat / 2
+    if x <= 0:
+        return 1.0
+    scale = exp(-x + a * log(x) - lgamma(a))
+    if x < a + 1:
+        # Series expansion of the lower incomplete gamma function
+        term = total = 1 / a
+        n = 0
+        while term > total * 1e-15:
+            n += 1
+            term *= x / (a + n)
+            total += term
+        return max(0.0, 1 - total * scale)
+    # Continued fraction of the upper incomplete gamma function (Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = d if abs(d) > tiny else tiny
+        c = b + an / c
+        c = c if abs(c) > tiny else tiny
+        d = 1 / d
+        h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return scale * h
+
+
+def chi_square_test(observed: Sequence[int], expected: Sequence[float]) -> float:
+    """Performs Pearson's chi-square test and returns the p-value."""
+    stat = sum((o - e) ** 2 / e for o, e in zip(observed, expected))
+    return chi2_sf(stat, len(observed) - 1)
+
+
+def g_test(observed: Sequence[int], expected: Sequence[float]) -> float:
+    """Performs a G-test of goodness of fit and returns the p-value."""
+    stat = 2 * sum(o * log(o / e) for o, e in zip(observed, expected) if o)
+    return chi2_sf(stat, len(observed) - 1)
+
+
+def check_simulation(
+    games: int, seed: int, workers: Optional[int], alpha: float
+) -> List[str]:
+    """Runs seeded simulations of all strategies in parallel and tests them.
+
+    Returns:
+        List of error messages. Empty if all checks pass.
+    """
+    chunk_count = 4 * (workers or 8)
+    chunk_size, remainder = divmod(games, chunk_count)
+    tasks = [
+        (strategy, seed + j * chunk_count + i, chunk_size + (i < remainder))
+        for j, strategy in enumerate(STRATEGIES)
+        for i in range(chunk_count)
+    ]
+
+    totals = {strategy: Tally() for strategy in STRATEGIES}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [(task[0], executor.submit(simulate, *task)) for task in tasks]
+        for strategy, future in futures:
+            totals[strategy].merge(future.result())
+
+    errors = []
+    z_limit = NormalDist().inv_cdf(1 - alpha / 2)
+    for strategy, total in totals.items():
+        line_bet, _ = STRATEGIES[strategy]
+        n = total.games
+        tests = []
+
+        dice_counts = total.dice_counts
+        rolls = sum(dice_counts)
+        tests.append(
+            (
+                "dice chi-square",
+                chi_square_test(dice_counts, [rolls / len(DICE)] * len(DICE)),
+            )
+        )
+
+        roll_counts = [0] * 13
+        for (a, b), count in zip(DICE, dice_counts):
+            roll_counts[a + b] += count
+        tests.append(
+            (
+                "roll sum G-test",
+                g_test(
+                    roll_counts[2:],
+                    [rolls * float(ROLL_PROBABILITY[t]) for t in range(2, 13)],
+                ),
+            )
+        )
+
+        probabilities = LINE_BET_OUTCOME_PROBABILITY[line_bet]
+        outcome_counts = total.outcome_counts
+        unexpected = set(o for o, c in outcome_counts.items() if c) - set(probabilities)
+        if unexpected:
+            errors.append(f"{strategy}: impossible outcomes {unexpected}")
+        tests.append(
+            (
+                "line bet outcome G-test",
+                g_test(
+                    [outcome_counts[o] for o in probabilities],
+                    [n * float(p) for p in probabilities.values()],
+                ),
+            )
+        )
+
+        mean = total.gain_sum / n
+        variance = total.gain_square_sum / n - mean ** 2
+        expected_mean = 10 * float(LINE_BET_EXPECTED_GAIN[line_bet])
+        z = (mean - expected_mean) / sqrt(variance / n)
+
+        print(f"{strategy}: {n} games, {rolls} rolls")
+        for name, p_value in tests:
+            print(f"  {name}: p = {p_value:.4f}")
+            if p_value < alpha:
+                errors.append(f"{strategy}: {name} failed (p = {p_value:.3g})")
+        print(f"  mean gain: {mean:.4f} (expected {expected_mean:.4f}, z = {z:.2f})")
+        if abs(z) > z_limit:
+            errors.append(f"{strategy}: mean gain off by {z:.2f} standard errors")
+    return errors
+
+
+def _games_arg(value: str) -> int:
+    """Parses the --games argument, which is either 0 or at least MIN_GAMES."""
+    games = int(value)
+    if games != 0 and games < MIN_GAMES:
+        raise argparse.ArgumentTypeError(
+            f"must be 0 (to skip the simulation) or at least {MIN_GAMES}"
+        )
+    return games
+
+
+def main() -> int:
+    """Runs all checks and returns the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--games",
+        type=_games_arg,
+        default=200000,
+        help="games per strategy to simulate",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument(
+        "--alpha", type=float, default=1e-4, help="significance level of each test"
+    )
+    args = parser.parse_args()
+
+    kind = "compiled" if game.is_compiled() else "pure Python"
+    print(f"Game engine: {kind}")
+    errors = check_exhaustive()
+    print(f"Exhaustive check: {len(errors)} error(s)")
+    if args.games > 0:
+        errors += check_simulation(args.games, args.seed, args.workers, args.alpha)
+
+    for error in errors:
+        print(error, file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())